@@ -447,7 +447,8 @@ class Soma(Compartment):
 
         super().__init__(name, model, **kwargs)
         self._events = None
-        self._event_actions = None
+        self._event_actions_list = None
+        self._check_flags = None
 
     def __str__(self):
         ephys_dict = self._ephys_object.__dict__
@@ -496,7 +497,8 @@ class Dendrite(Compartment):
     def __init__(self, name: str, model: str = 'passive', **kwargs: Quantity):
         super().__init__(name, model, **kwargs)
         self._events = None
-        self._event_actions = None
+        self._event_actions_list = None
+        self._check_flags = None
 
     def __str__(self):
         ephys_dict = self._ephys_object.__dict__
@@ -602,12 +604,20 @@ class Dendrite(Compartment):
         self._events[f"activate_I_Na_{name}"] = condition_I_Na.format(name)
         self._events[f"activate_I_Kn_{name}"] = condition_I_Kn.format(name)
 
-        # Specify what is going to happen inside run_on_event()
-        if not self._event_actions:
-            self._event_actions = library['run_on_Na_spike'].format(name)
-        else:
-            self._event_actions += "\n" + \
-                library['run_on_Na_spike'].format(name)
+        # Specify what is going to happen inside run_on_event(), stored as
+        # (event, code) tuples that are registered when a NeuronModel is
+        # linked to a NeuronGroup:
+        if not self._event_actions_list:
+            self._event_actions_list = []
+        self._event_actions_list += [
+            (f"activate_I_Na_{name}", library['action_I_Na'].format(name)),
+            (f"activate_I_Kn_{name}", library['action_I_Kn'].format(name))]
+        # Pre-format the checkpoint variables that are initialized when a
+        # NeuronModel is linked to a NeuronGroup:
+        if not self._check_flags:
+            self._check_flags = []
+        self._check_flags += [(f"allow_I_Na_{name}", True),
+                              (f"allow_I_Kn_{name}", False)]
         # Include params needed
         if not self._params:
             self._params = {}
@@ -690,4 +700,7 @@ class Dendrite(Compartment):
         str
             Executable code that runs automatically in the background.
         """
-        return self._event_actions
+        if not self._event_actions_list:
+            return None
+        return '\n'.join([f"run_on_event('{event}', '{code}')"
+                          for event, code in self._event_actions_list])
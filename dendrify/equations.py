@@ -1,5 +1,13 @@
 # A dictionary that contains templates of frequently used models or strings
 
+# Code fragments that run when a dSpike event fires. They are defined once
+# here so that the 'action_*' entries and the composed 'run_on_*' templates
+# below cannot drift apart:
+_action_I_Na = 'g_Na_{0} += g_Na_{0}_max; allow_I_Na_{0}=False; allow_I_Kn_{0}=True; timer_Na_{0} = t'
+_action_I_Kn = 'g_Kn_{0} += g_Kn_{0}_max; allow_I_Kn_{0}=False; allow_I_Na_{0}=True'
+_action_I_Ca = 'g_Ca_{0} += g_Ca_{0}_max; allow_I_Ca_{0}=False; allow_I_Kc_{0}=True; timer_Ca_{0} = t'
+_action_I_Kc = 'g_Kc_{0} += g_Kc_{0}_max; allow_I_Kc_{0}=False; allow_I_Ca_{0}=True'
+
 library = {
     # Adaptive exponential integrate & fire:
     'adex': ('dV{0}/dt = (gL{0} * (EL{0}-V{0}) + gL{0}*DeltaT{0}*exp((V{0}-Vth{0})/DeltaT{0}) + I{0} - w{0}) / C{0}  :volt\n'
@@ -61,9 +69,17 @@ library = {
 
     'condition_I_Kc': 't > (timer_Ca_{0} + offset_Kc) and allow_I_Kc_{0}',
 
-    'run_on_Na_spike': ("run_on_event('activate_I_Na_{0}', 'g_Na_{0} += g_Na_{0}_max; allow_I_Na_{0}=False; allow_I_Kn_{0}=True; timer_Na_{0} = t') \n"
-                        "run_on_event('activate_I_Kn_{0}', 'g_Kn_{0} += g_Kn_{0}_max; allow_I_Kn_{0}=False; allow_I_Na_{0}=True')"),
+    'action_I_Na': _action_I_Na,
+
+    'action_I_Kn': _action_I_Kn,
+
+    'action_I_Ca': _action_I_Ca,
+
+    'action_I_Kc': _action_I_Kc,
+
+    'run_on_Na_spike': ("run_on_event('activate_I_Na_{0}', '" + _action_I_Na + "') \n"
+                        "run_on_event('activate_I_Kn_{0}', '" + _action_I_Kn + "')"),
 
-    'run_on_Ca_spike': ("run_on_event('activate_I_Ca_{0}', 'g_Ca_{0} += g_Ca_{0}_max; allow_I_Ca_{0}=False; allow_I_Kc_{0}=True; timer_Ca_{0} = t') \n"
-                        "run_on_event('activate_I_Kc_{0}', 'g_Kc_{0} += g_Kc_{0}_max; allow_I_Kc_{0}=False; allow_I_Ca_{0}=True')")
+    'run_on_Ca_spike': ("run_on_event('activate_I_Ca_{0}', '" + _action_I_Ca + "') \n"
+                        "run_on_event('activate_I_Kc_{0}', '" + _action_I_Kc + "')")
 }
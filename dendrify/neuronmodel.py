@@ -1,12 +1,14 @@
-import sys
-from typing import List, Optional, Tuple, Union
+from __future__ import annotations
 
-import __main__ as main
-from brian2 import NeuronGroup
-from brian2.units import Quantity, mV
+from itertools import chain
+from typing import TYPE_CHECKING, List, Optional, Tuple, Union
 
 from .compartment import Compartment, Dendrite, Soma
 
+if TYPE_CHECKING:
+    from brian2 import NeuronGroup
+    from brian2.units import Quantity
+
 
 class NeuronModel:
     """
@@ -57,64 +59,84 @@ class NeuronModel:
     >>> model = NeuronModel(connections)
     """
 
-    # Default values for key ionic mechanisms
-    DEFAULTS = {"E_AMPA": 0 * mV,
-                "E_NMDA": 0 * mV,
-                "E_GABA": -80 * mV,
-                "E_Na": 70 * mV,
-                "E_K": -89 * mV,
-                "E_Ca": 136 * mV,
-                "Mg": 1.0,
-                "alpha": 0.062,
-                "beta": 3.57,
-                "gamma": 0}
+    # Default values for key ionic mechanisms (see _defaults below)
+    _defaults_cache = None
+
+    @classmethod
+    def _defaults(cls) -> dict:
+        """
+        Builds the default values for key ionic mechanisms. The dictionary is
+        created on first use and memoized on the class, so that importing
+        dendrify does not trigger the (heavy) brian2 import.
+
+        Returns
+        -------
+        dict
+        """
+        if cls._defaults_cache is None:
+            from brian2.units import mV
+            cls._defaults_cache = {"E_AMPA": 0 * mV,
+                                   "E_NMDA": 0 * mV,
+                                   "E_GABA": -80 * mV,
+                                   "E_Na": 70 * mV,
+                                   "E_K": -89 * mV,
+                                   "E_Ca": 136 * mV,
+                                   "Mg": 1.0,
+                                   "alpha": 0.062,
+                                   "beta": 3.57,
+                                   "gamma": 0}
+        return cls._defaults_cache
 
     def __init__(self, connections: List[
             Tuple[Compartment, Compartment, Union[str, Quantity]]], **kwargs):
         self._namespace = None
         self._compartments = None
         self._linked_neurongroup = None
-        self._varscope = None
         self._extra_equations = None
         self._extra_params = None
         self._graph = None
+        self._layout_cache = None
+        self._equations_cache = None
+        self._parameters_cache = None
+        self._events_cache = None
+        self._event_actions_cache = None
         self._parse_compartments(connections)
         self._set_properties(**kwargs)
 
     def __str__(self):
+        sep = '-' * 45
         equations = self.equations.replace('\n', '\n    ')
-        if self.parameters:
-            params_sorted = {key: self.parameters[key]
-                             for key in sorted(self.parameters)}
-            parameters = '\n'.join([f"    '{i[0]}': {i[1]}"
-                                    for i in params_sorted.items()])
+        all_params = self.parameters
+        if all_params:
+            parameters = '\n'.join([f"    '{key}': {value}"
+                                    for key, value
+                                    in sorted(all_params.items())])
         else:
             parameters = '   None'
 
         if self._extra_params:
-            extra_params_sorted = {key: self._extra_params[key]
-                                   for key in sorted(self._extra_params)}
-            extra_params = '\n'.join([f"    '{i[0]}': {i[1]}"
-                                      for i in extra_params_sorted.items()])
+            extra_params = '\n'.join([f"    '{key}': {value}"
+                                      for key, value
+                                      in sorted(self._extra_params.items())])
         else:
             extra_params = '   None'
 
-        events = '\n'.join([f"    '{key}': '{self.events[key]}'"
-                            for key in self.events
+        events = '\n'.join([f"    '{key}': '{value}'"
+                            for key, value in self.events.items()
                             ]) if self.events else '    None'
 
-        msg = (f"OBJECT TYPE:\n\n  {self.__class__}\n\n"
-               f"{'-'*45}\n\n"
-               "PROPERTIES (type): \n\n"
-               f"\u2192 equations (str):\n    {equations}\n\n"
-               f"\u2192 parameters (dict):\n{parameters}\n\n"
-               f"\u2192 events (dict):\n{events}\n"
-               f"\n{'-'*45}\n\n"
-               f"USEFUL ATTRIBUTES:\n\n"
-               f"\u2192 _linked_neurongroup:\n    {self._linked_neurongroup}\n\n"
-               f"\u2192 _extra_equations:\n    {self._extra_equations}\n\n"
-               f"\u2192 _extra_params:\n{extra_params}\n")
-        return msg
+        parts = [f"OBJECT TYPE:\n\n  {self.__class__}\n\n",
+                 f"{sep}\n\n",
+                 "PROPERTIES (type): \n\n",
+                 f"\u2192 equations (str):\n    {equations}\n\n",
+                 f"\u2192 parameters (dict):\n{parameters}\n\n",
+                 f"\u2192 events (dict):\n{events}\n",
+                 f"\n{sep}\n\n",
+                 "USEFUL ATTRIBUTES:\n\n",
+                 f"\u2192 _linked_neurongroup:\n    {self._linked_neurongroup}\n\n",
+                 f"\u2192 _extra_equations:\n    {self._extra_equations}\n\n",
+                 f"\u2192 _extra_params:\n{extra_params}\n"]
+        return ''.join(parts)
 
     def _parse_compartments(self, comp_list):
         error_msg = (
@@ -128,31 +150,49 @@ class NeuronModel:
             "(comp3, comp4, 'cylinder_c3')]\n")
 
         self._compartments = []
+        self._somas = []
+        self._dendrites = []
         self._graph = []
+        # Compartments are about to change, so any merged properties that
+        # were memoized from them are no longer valid:
+        self._equations_cache = None
+        self._parameters_cache = None
+        self._events_cache = None
+        self._event_actions_cache = None
+        # Track already registered compartments and edges by identity, so
+        # membership checks stay O(1) as the model grows:
+        seen_comps = set()
+        seen_edges = set()
         for comp in comp_list:
             pre, post = comp[0], comp[1]
 
             # Prohibit self connections
             if pre is post:
-                print(f"ERROR: Cannot connect '{pre.name}' to itself.")
-                print(error_msg)
-                sys.exit()
+                raise ValueError(
+                    f"Cannot connect '{pre.name}' to itself.\n{error_msg}")
 
             # Ensure that users do not use objects that make no sense
             if not (isinstance(pre, Compartment) and
                     isinstance(post, Compartment)):
-                print(f"ERROR: Unknown compartment type provided.")
-                print(error_msg)
-                sys.exit()
+                raise TypeError(
+                    f"Unknown compartment type provided.\n{error_msg}")
 
             # Store graph-like representation for debugging or visualization
-            self._graph.append((pre.name, post.name))
-
-            # Include all compartments in a list for easy access
-            if pre not in self._compartments:
-                self._compartments.append(pre)
-            if post not in self._compartments:
-                self._compartments.append(post)
+            edge = (pre.name, post.name)
+            if edge not in seen_edges:
+                seen_edges.add(edge)
+                self._graph.append(edge)
+
+            # Include all compartments in a list for easy access, also sorted
+            # by type so properties do not need repeated isinstance checks:
+            for comp_obj in (pre, post):
+                if id(comp_obj) not in seen_comps:
+                    seen_comps.add(id(comp_obj))
+                    self._compartments.append(comp_obj)
+                    if isinstance(comp_obj, Soma):
+                        self._somas.append(comp_obj)
+                    else:
+                        self._dendrites.append(comp_obj)
 
             # Call the connect method from the Compartment class
             if len(comp) == 2:
@@ -162,18 +202,22 @@ class NeuronModel:
 
     def _set_properties(self, cm=None, gl=None, r_axial=None, v_rest=None,
                         scale_factor=None, spine_factor=None):
-        for i in self._compartments:
-            if cm and (not i._ephys_object.cm):
-                i._ephys_object.cm = cm
-            if gl and (not i._ephys_object.gl):
-                i._ephys_object.gl = gl
-            if r_axial and (not i._ephys_object.r_axial):
-                i._ephys_object.r_axial = r_axial
-            if v_rest and (not i._ephys_object.v_rest):
-                i._ephys_object.v_rest = v_rest
-            if scale_factor:
+        # Check each kwarg once instead of per compartment; model-wide values
+        # only fill in ephys attributes that are not set per compartment:
+        overrides = [(attr, value)
+                     for attr, value in (('cm', cm), ('gl', gl),
+                                         ('r_axial', r_axial),
+                                         ('v_rest', v_rest))
+                     if value is not None]
+        for attr, value in overrides:
+            for i in self._compartments:
+                if getattr(i._ephys_object, attr) is None:
+                    setattr(i._ephys_object, attr, value)
+        if scale_factor is not None:
+            for i in self._compartments:
                 i._ephys_object.scale_factor = scale_factor
-            if spine_factor:
+        if spine_factor is not None:
+            for i in self._compartments:
                 if isinstance(i, Dendrite):
                     i._ephys_object.spine_factor = spine_factor
 
@@ -204,8 +248,8 @@ class NeuronModel:
         """
         # Make sure user provides a valid option:
         if channel not in ['Na', 'Ca']:
-            print("Please select a valid dendritic spike type ('Na' or 'Ca')")
-            sys.exit()
+            raise ValueError(
+                "Please select a valid dendritic spike type ('Na' or 'Ca').")
         # Choose param names based on user input:
         if channel == 'Na':
             dspike_params = {'refractory_Na': refractory,
@@ -231,6 +275,7 @@ class NeuronModel:
         if not self._extra_params:
             self._extra_params = {}
         self._extra_params.update(params_dict)
+        self._parameters_cache = None
 
     def add_equations(self, eqs: str):
         """
@@ -245,6 +290,57 @@ class NeuronModel:
             self._extra_equations = f"{eqs}"
         else:
             self._extra_equations += f"\n{eqs}"
+        self._equations_cache = None
+
+    def to_neurongroup(self, N: int, method: str = 'euler',
+                       threshold: Optional[str] = None,
+                       reset: Optional[str] = None,
+                       namespace: Optional[dict] = None,
+                       **kwargs) -> NeuronGroup:
+        """
+        Creates a
+        :doc:`NeuronGroup <brian2:reference/brian2.groups.neurongroup.NeuronGroup>`
+        from a NeuronModel and automatically links the two. This is a
+        convenient alternative to constructing a NeuronGroup by hand and then
+        calling :meth:`link`, since the model's equations, events and
+        parameters are passed to Brian in a single step.
+
+        Parameters
+        ----------
+        N : int
+            The number of neurons in the group.
+        method : str, optional
+            The numerical integration method, by default ``'euler'``.
+        threshold : str, optional
+            The condition which produces (somatic) spikes, by default ``None``.
+        reset : str, optional
+            The statement(s) that are executed upon reset, by default ``None``.
+        namespace : dict, optional
+            Extra entries that complement (or override) the model's
+            parameters, by default ``None``.
+        kwargs
+            Any other keyword arguments accepted by Brian's NeuronGroup.
+
+        Returns
+        -------
+        brian2.NeuronGroup
+            A NeuronGroup that is already linked to the NeuronModel.
+
+        Example
+        -------
+        >>> model = NeuronModel(connections)
+        >>> ng = model.to_neurongroup(10, threshold='V_soma > -40*mV',
+        >>>                           reset='V_soma = -55*mV')
+        """
+        from brian2 import NeuronGroup
+        group_namespace = dict(self.parameters)
+        if namespace:
+            group_namespace.update(namespace)
+        ng = NeuronGroup(N, model=self.equations, method=method,
+                         threshold=threshold, reset=reset, events=self.events,
+                         namespace=group_namespace, **kwargs)
+        self.link(ng)
+        return ng
 
     def link(self, ng: NeuronGroup, automate: str = 'all',
              verbose: bool = False):
@@ -266,10 +362,7 @@ class NeuronModel:
             background by dendrify, by default ``False``
         """
         self._namespace = ng.namespace
-        self._varscope = main.__dict__
-        items = main.__dict__.items()
-        ng_name = [k for k, v in items if v is ng][0]
-        self._linked_neurongroup = ng_name, ng
+        self._linked_neurongroup = ng
 
         if automate == 'all':
             self._set_rest(verbose)
@@ -283,56 +376,43 @@ class NeuronModel:
 
     def _set_rest(self, verbose=False):
         """
-        Creates and runs executable code that initialises V rest across all
-        NeuronModel _compartments.
+        Initializes V rest across all NeuronModel _compartments by writing
+        directly to the state variables of the linked NeuronGroup.
         """
-        command = '{0}.V_{1} = {2}'
-
         # When model parameters are passed as dict to the NeuronGroup:
         if self._namespace:
-            commands = [command.format(self._linked_neurongroup[0], i.name,
-                                       repr(self._namespace['EL_'+i.name]))
-                        for i in self._compartments]
-        executable = '\n'.join(commands)
-        if verbose:
-            print(executable)
-        exec(executable, self._varscope)
+            resting_potentials = {f'V_{i.name}': self._namespace['EL_'+i.name]
+                                  for i in self._compartments}
+            self._linked_neurongroup.set_states(resting_potentials)
+            if verbose:
+                for var, value in resting_potentials.items():
+                    print(f"{var} = {value}")
 
     def _handle_events(self, verbose=False):
         """
-        Creates and runs executable code that:
-        a) Initializes custom event checkpoint variables.
-        b) Specifies what happens during custom events.
+        a) Initializes custom event checkpoint variables directly on the
+           linked NeuronGroup.
+        b) Registers what happens during custom events through Brian's
+           run_on_event().
         """
-        ng_name = self._linked_neurongroup[0]
+        ng = self._linked_neurongroup
         # Find all active _compartments:
         active_comps = [i for i in self._compartments if i._events]
         if active_comps == []:
             if verbose:
                 print("\n<No custom events found>")
             return
-        # Na spike vs Ca spike branches
-        comps_Na = filter(lambda x: '_I_Na_' in x.event_actions, active_comps)
-        comps_Ca = filter(lambda x: '_I_Ca_' in x.event_actions, active_comps)
-        # Initial compditions for the custom events needed for dspikes:
-        checks_Na = ('{0}.allow_I_Na_{1} = True \n'
-                     '{0}.allow_I_Kn_{1} = False')
-        checks_Ca = ('{0}.allow_I_Ca_{1} = True \n'
-                     '{0}.allow_I_Kc_{1} = False')
-        # Compartment specific initial compditions:
-        checks_Na_comp = [checks_Na.format(ng_name, i.name) for i in comps_Na]
-        checks_Ca_comp = [checks_Ca.format(ng_name, i.name) for i in comps_Ca]
-        # All initial compditions and actions needed for dspikes:
-        all_checks = checks_Na_comp + checks_Ca_comp
-        all_actions = [i.event_actions for i in active_comps]
-        # Megrge all actions and checks into a single string:
-        commands = '\n'.join(all_checks + all_actions)
-
-        executable = commands.replace('run_on_event',
-                                      f'{ng_name}.run_on_event')
-        if verbose:
-            print(executable)
-        exec(executable, self._varscope)
+        # Each compartment carries its own pre-built checkpoint pairs and
+        # (event, code) tuples, so a single pass handles both the initial
+        # conditions and the actions needed for dspikes (no Na/Ca
+        # partitioning required):
+        for comp in active_comps:
+            for check, value in comp._check_flags:
+                setattr(ng, check, value)
+            for event, code in comp._event_actions_list:
+                ng.run_on_event(event, code)
+                if verbose:
+                    print(f"run_on_event('{event}', '{code}')")
 
     def as_graph(self, fontsize: int = 10, fontcolor: str = 'white',
                  scale_nodes: float = 1, color_soma: str = '#4C6C92',
@@ -370,10 +450,8 @@ class NeuronModel:
         import networkx as nx
 
         # Separate soma from dendrites
-        soma, dendrites = [], []
-        for comp in self._compartments:
-            target = soma if isinstance(comp, Soma) else dendrites
-            target.append(comp.name)
+        soma = [comp.name for comp in self._somas]
+        dendrites = [comp.name for comp in self._dendrites]
 
         # Make graph
         G = nx.Graph()
@@ -383,9 +461,18 @@ class NeuronModel:
         fig, ax = plt.subplots()
         for d in ['right', 'top', 'left', 'bottom']:
             ax.spines[d].set_visible(False)
-        pos = nx.spring_layout(G, fixed=soma, pos={soma[0]: (0, 0)},
-                               k=0.05*scale_edges, iterations=100,
-                               seed=seed)
+        # Computing a spring layout is costly (100 Fruchterman-Reingold
+        # iterations), so reuse the previous one as long as the model
+        # topology and the layout-affecting arguments are unchanged. This
+        # makes repeated calls cheap when only colors/fonts are tuned:
+        layout_key = (tuple(sorted(self._graph)), scale_edges, seed)
+        if self._layout_cache and self._layout_cache[0] == layout_key:
+            pos = self._layout_cache[1]
+        else:
+            pos = nx.spring_layout(G, fixed=soma, pos={soma[0]: (0, 0)},
+                                   k=0.05*scale_edges, iterations=100,
+                                   seed=seed)
+            self._layout_cache = (layout_key, pos)
         nx.draw_networkx_nodes(G, pos, nodelist=dendrites,
                                node_color=color_dendrites,
                                node_size=1200*scale_nodes, margins=0.1,
@@ -409,10 +496,12 @@ class NeuronModel:
         str
             All model equations.
         """
-        all_eqs = [i._equations for i in self._compartments]
-        if self._extra_equations:
-            all_eqs.append(self._extra_equations)
-        return '\n\n'.join(all_eqs)
+        if self._equations_cache is None:
+            all_eqs = [i._equations for i in self._compartments]
+            if self._extra_equations:
+                all_eqs.append(self._extra_equations)
+            self._equations_cache = '\n\n'.join(all_eqs)
+        return self._equations_cache
 
     @property
     def parameters(self) -> dict:
@@ -424,13 +513,15 @@ class NeuronModel:
         dict
             All model parameters.
         """
-        d = {}
-        for i in self._compartments:
-            d.update(i.parameters)
-        d.update(self.DEFAULTS)
-        if self._extra_params:
-            d.update(self._extra_params)
-        return d
+        if self._parameters_cache is None:
+            # A single dict build instead of chained update() calls; later
+            # entries (defaults, extra params) override compartment params:
+            self._parameters_cache = dict(chain(
+                chain.from_iterable(i.parameters.items()
+                                    for i in self._compartments),
+                self._defaults().items(),
+                (self._extra_params or {}).items()))
+        return self._parameters_cache
 
     @property
     def events(self) -> dict:
@@ -442,12 +533,13 @@ class NeuronModel:
         dict
             All model custom events for dendritic spiking.
         """
-        d_out = {}
-        all_events = [i._events for i in self._compartments
-                      if i._events and isinstance(i, Dendrite)]
-        for d in all_events:
-            d_out.update(d)
-        return d_out
+        if self._events_cache is None:
+            d_out = {}
+            all_events = [i._events for i in self._dendrites if i._events]
+            for d in all_events:
+                d_out.update(d)
+            self._events_cache = d_out
+        return self._events_cache
 
     @property
     def event_actions(self) -> list:
@@ -459,6 +551,8 @@ class NeuronModel:
         list
             All event actions for dendritic spiking
         """
-        all_actions = [i._event_actions for i in self._compartments
-                       if i._event_actions and isinstance(i, Dendrite)]
-        return all_actions
+        if self._event_actions_cache is None:
+            self._event_actions_cache = [i.event_actions
+                                         for i in self._dendrites
+                                         if i._event_actions_list]
+        return self._event_actions_cache